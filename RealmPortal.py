@@ -5,40 +5,290 @@ A tool to migrate WoW interface configurations between different realms and char
 """
 
 import os
+import sys
+import errno
 import shutil
+import subprocess
+import tempfile
 import re
 import argparse
 import logging
+import mmap
 from pathlib import Path
 from typing import Dict, List, Tuple
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# File extensions that typically contain WoW configuration data. Anything else,
+# including the .bak/.old/.tmp/.backup copies addons leave behind, is skipped.
+CONFIG_EXTENSIONS = frozenset({'lua', 'txt', 'toc', 'xml', 'wtf'})
+
+# Files larger than this are memory-mapped rather than read into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# Files larger than this are rewritten in chunks of STREAM_CHUNK_SIZE bytes
+STREAM_THRESHOLD = 16 * 1024 * 1024
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Word character as understood by \b on decoded text
+_WORD_CHAR = re.compile(r'\w')
+
+# Thread count for I/O-bound file work when none is given
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _configure_logging(verbose: bool = False):
+    """Set up logging to wow_ui_migration.log and the console, once per process.
+    
+    Per-folder and per-file changes are logged at DEBUG level, so they only show
+    up when verbose is set; the default output is the migration summary.
+    """
+    if logging.getLogger().handlers:
+        return
+    
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('wow_ui_migration.log', delay=True),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def _walk(path, follow_symlinks: bool = False, onerror=None):
+    """Walk a directory tree top-down, yielding (root, dirs, files) like os.walk.
+    
+    Uses os.fwalk where available (POSIX), which stats entries relative to an open
+    directory descriptor instead of resolving every full path. dirs may be pruned
+    in place to skip subtrees. Symlinked directories (and junctions) are listed in
+    dirs but only walked into when follow_symlinks is set. As with os.walk, folders
+    that can't be listed are skipped silently unless onerror is given, in which case
+    it is called with the OSError. os.fwalk only reports such errors relative to an
+    open directory descriptor, so walks with onerror use the scandir walk instead.
+    """
+    path = str(path)
+    if hasattr(os, 'fwalk') and onerror is None:
+        for root, dirs, files, _ in os.fwalk(path, follow_symlinks=follow_symlinks):
+            yield root, dirs, files
+    else:
+        yield from _scandir_walk(path, follow_symlinks, onerror)
+
+
+def _scandir_walk(path, follow_symlinks: bool = False, onerror=None):
+    """os.scandir based fallback for _walk, classifying entries the same way as os.fwalk."""
+    dirs, files, links = [], [], set()
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                    if entry.is_symlink() or getattr(entry, 'is_junction', lambda: False)():
+                        links.add(entry.name)
+                else:
+                    files.append(entry.name)
+    except OSError as e:
+        if onerror is not None:
+            onerror(e)
+        return
+    
+    yield path, dirs, files
+    for name in dirs:
+        if follow_symlinks or name not in links:
+            yield from _scandir_walk(os.path.join(path, name), follow_symlinks, onerror)
+
+
+def _is_ascii(text):
+    """Return True if text only contains ASCII characters."""
+    try:
+        text.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _is_word_char(char_bytes, last: bool = False):
+    """Return True if the first (or last) UTF-8 character in char_bytes is a word character."""
+    text = bytes(char_bytes).decode('utf-8', 'ignore')
+    return bool(text) and _WORD_CHAR.match(text[-1] if last else text[0]) is not None
+
+
+def _is_ascii_word_byte(byte):
+    """Return True if byte is an ASCII word character."""
+    return byte < 0x80 and (chr(byte).isalnum() or byte == 0x5F)
+
+
+class _BytesNamePattern:
+    """Alternation of ASCII names matched on raw UTF-8 bytes with the word boundaries
+    \\b would give on the decoded text.
+    
+    A bytes \\b only knows ASCII word characters, so each name gets lookarounds for
+    its own ends instead: a name starting (or ending) with a word character must not
+    touch an ASCII word character there, one starting with a non-word character must
+    touch a word character or a non-ASCII byte. Non-ASCII neighbours are decoded and
+    checked after the match. When that check rejects a match, the shorter names are
+    tried at the same position before moving on one byte, as the regex engine does
+    with \\b. Offers finditer() and pattern like a compiled pattern.
+    """
+    
+    def __init__(self, names: List[str]):
+        pieces = []
+        for name in names:
+            name = name.encode('ascii')
+            if _is_ascii_word_byte(name[0]):
+                before = rb'(?<![A-Za-z0-9_])'
+            else:
+                before = rb'(?<=[A-Za-z0-9_\x80-\xff])'
+            if _is_ascii_word_byte(name[-1]):
+                after = rb'(?![A-Za-z0-9_])'
+            else:
+                after = rb'(?=[A-Za-z0-9_\x80-\xff])'
+            pieces.append(before + re.escape(name) + after)
+        self.alternatives = [re.compile(piece, re.IGNORECASE) for piece in pieces]
+        self.regex = re.compile(b'|'.join(pieces), re.IGNORECASE)
+        self.pattern = self.regex.pattern
+    
+    @staticmethod
+    def _boundaries_ok(data, start, end):
+        """Check the non-ASCII characters around data[start:end] against \\b."""
+        if start > 0 and data[start - 1] >= 0x80:
+            lead = start - 1
+            while lead > max(start - 4, 0) and data[lead] & 0xC0 == 0x80:
+                lead -= 1
+            if _is_word_char(data[lead:start], last=True) == _is_ascii_word_byte(data[start]):
+                return False
+        if end < len(data) and data[end] >= 0x80:
+            if _is_word_char(data[end:end + 4]) == _is_ascii_word_byte(data[end - 1]):
+                return False
+        return True
+    
+    def finditer(self, data, pos: int = 0):
+        """Yield the matches in data from pos on, left to right without overlaps."""
+        while True:
+            m = self.regex.search(data, pos)
+            if m is None:
+                return
+            start = m.start()
+            if not self._boundaries_ok(data, start, m.end()):
+                # Try the other names at the same position, longest first
+                for alternative in self.alternatives:
+                    m = alternative.match(data, start)
+                    if m and self._boundaries_ok(data, start, m.end()):
+                        break
+                else:
+                    pos = start + 1
+                    continue
+            yield m
+            pos = m.end()
+
+
+def _apply_mappings(data, pattern, lut):
+    """Replace every match of pattern in the raw file data, returning (new_data, count).
+    
+    Bytes patterns run directly on data; text patterns decode it first.
+    """
+    if isinstance(pattern.pattern, bytes):
+        parts = []
+        pos = 0
+        for m in pattern.finditer(data):
+            parts.append(data[pos:m.start()])
+            parts.append(lut[m.group(0).lower()])
+            pos = m.end()
+        if not parts:
+            return data, 0
+        parts.append(data[pos:])
+        return b''.join(parts), len(parts) // 2
+    
+    content, n = pattern.subn(lambda m: lut[m.group(0).lower()], bytes(data).decode('utf-8', 'ignore'))
+    return content.encode('utf-8'), n
+
+
+def _temp_file_beside(path):
+    """Create a uniquely named temporary file next to path, returning (fd, tmp_path)."""
+    return tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+
+
+def _fast_copytree(src, dst):
+    """Copy a directory tree, using robocopy on Windows and threaded copies elsewhere."""
+    src, dst = str(src), str(dst)
+    
+    if sys.platform == "win32":
+        try:
+            # /E keeps empty folders like shutil.copytree; codes below 8 mean success
+            result = subprocess.run(
+                ["robocopy", src, dst, "/E", "/MT:16", "/NDL", "/NFL", "/NP", "/NJH", "/NJS"],
+                stdout=subprocess.DEVNULL
+            )
+            if result.returncode < 8:
+                return
+            raise OSError(f"robocopy failed with exit code {result.returncode}")
+        except FileNotFoundError:
+            pass  # robocopy unavailable, use the portable copy below
+    
+    # Create the directory structure serially, then copy files in parallel. Like
+    # shutil.copytree, symlinked folders are followed and copied as real folders,
+    # and every folder or file that can't be copied is reported in a shutil.Error.
+    errors = []
+    
+    def walk_error(e):
+        errors.append((e.filename, os.path.normpath(os.path.join(dst, os.path.relpath(e.filename, src))), str(e)))
+    
+    def copy_file(pair):
+        try:
+            shutil.copy2(*pair)
+        except OSError as e:
+            return pair[0], pair[1], str(e)
+    
+    files = []
+    for root, dirs, names in _walk(src, follow_symlinks=True, onerror=walk_error):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root)
+        files.extend((os.path.join(root, name), os.path.join(target_root, name)) for name in names)
+    
+    with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as executor:
+        errors.extend(error for error in executor.map(copy_file, files) if error)
+    
+    if errors:
+        raise shutil.Error(errors)
+
+
+def _job_count(value: str) -> int:
+    """argparse type for --jobs: a thread count, 0 meaning automatic."""
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid thread count: {value!r}")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {jobs}")
+    return jobs
+
 
 class WoWUIMigrator:
-    def __init__(self, wtf_path: str, dry_run: bool = False):
+    def __init__(self, wtf_path: str, dry_run: bool = False, in_place: bool = False, jobs: int = 1):
         self.wtf_path = Path(wtf_path)
         self.dry_run = dry_run
+        self.in_place = in_place
+        if jobs < 0:
+            raise ValueError(f"jobs must be 0 or greater, got {jobs}")
+        self.jobs = jobs  # Threads used for file content updates, 0 picks a default
         self.changes_made = []
         self.working_path = self.wtf_path  # This will be updated when we create a copy
-        
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('wow_ui_migration.log'),
-                logging.StreamHandler()
-            ]
-        )
         self.logger = logging.getLogger(__name__)
-        
-        # File extensions that typically contain WoW configuration data
-        self.config_extensions = {
-            '.lua', '.txt', '.toc', '.xml', '.wtf'
-        }
     
     def create_migration_copy(self, old_realm: str, new_realm: str, 
                              old_char: str = None, new_char: str = None) -> str:
         """Create a copy of the WTF folder for migration, leaving original untouched."""
+        if self.in_place:
+            # Work directly on the original folder, skipping the copy entirely
+            self.working_path = self.wtf_path
+            if not self.dry_run:
+                self.logger.info(f"Migrating in place at: {self.wtf_path}")
+            else:
+                self.logger.info(f"[DRY RUN] Would migrate in place at: {self.wtf_path}")
+            return str(self.wtf_path)
+        
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         
         # Build descriptive name for the copy
@@ -52,7 +302,7 @@ class WoWUIMigrator:
         
         if not self.dry_run:
             self.logger.info(f"Creating migration copy at: {copy_path}")
-            shutil.copytree(self.wtf_path, copy_path)
+            _fast_copytree(self.wtf_path, copy_path)
             # Update working path to the copy
             self.working_path = copy_path
         else:
@@ -103,40 +353,38 @@ class WoWUIMigrator:
     def rename_folders(self, folder_mappings: Dict[str, str], old_account: str = None) -> List[Tuple[str, str]]:
         """Rename folders according to the mappings."""
         renamed_folders = []
+        account_path = os.path.join(str(self.working_path), "Account", old_account) if old_account else None
         
-        # Walk through all directories, process from deepest to shallowest
-        all_dirs = []
-        for root, dirs, files in os.walk(self.working_path):
-            for dir_name in dirs:
-                full_path = os.path.join(root, dir_name)
-                
-                # If we're migrating a specific account, only process that account's folders
-                if old_account:
-                    # Check if this path is under the specific account we want to migrate
-                    account_path = os.path.join(self.working_path, "Account", old_account)
-                    if not (full_path == account_path or full_path.startswith(account_path + os.sep)):
-                        # Also allow renaming the account folder itself
-                        if not (dir_name == old_account and "Account" in root):
-                            continue
-                
-                all_dirs.append((full_path, len(full_path.split(os.sep))))
+        # Local names for the hot loop below
+        join, dirname = os.path.join, os.path.dirname
+        
+        # Walk through all directories, bucketing them by depth
+        dirs_by_depth = defaultdict(list)
+        if account_path:
+            # Only walk the account being migrated; sibling accounts are never touched
+            top_path = account_path
+            if os.path.isdir(top_path):
+                dirs_by_depth[0].append((top_path, old_account))
+        else:
+            top_path = self.working_path
         
-        # Sort by depth (deepest first) to avoid conflicts
-        all_dirs.sort(key=lambda x: x[1], reverse=True)
+        # Depth is measured from top_path, so one count per directory visited is enough
+        base_depth = str(top_path).count(os.sep)
+        for root, dirs, files in _walk(top_path):
+            depth = root.count(os.sep) - base_depth + 1
+            dirs_by_depth[depth].extend((join(root, name), name) for name in dirs)
         
-        for dir_path, _ in all_dirs:
-            dir_name = os.path.basename(dir_path)
-            parent_dir = os.path.dirname(dir_path)
+        # Process from deepest to shallowest to avoid conflicts
+        all_dirs = [item for depth in sorted(dirs_by_depth, reverse=True) for item in dirs_by_depth[depth]]
+        
+        for dir_path, dir_name in all_dirs:
+            parent_dir = dirname(dir_path)
             
             # Check if this directory name needs to be changed
-            new_name = None
-            for old_name, replacement in folder_mappings.items():
-                if dir_name == old_name:
-                    new_name = replacement
-                    break
+            new_name = folder_mappings.get(dir_name)
             
             if new_name and new_name != dir_name:
-                new_path = os.path.join(parent_dir, new_name)
+                new_path = join(parent_dir, new_name)
                 
                 if not self.dry_run:
                     if os.path.exists(new_path):
@@ -144,13 +392,13 @@ class WoWUIMigrator:
                         # Try to merge directories if target exists
                         try:
                             self._merge_directories(dir_path, new_path)
-                            self.logger.info(f"Merged folder: {dir_path} -> {new_path}")
+                            self.logger.debug("Merged folder: %s -> %s", dir_path, new_path)
                         except Exception as e:
                             self.logger.error(f"Failed to merge {dir_path} -> {new_path}: {e}")
                             continue
                     else:
                         os.rename(dir_path, new_path)
-                        self.logger.info(f"Renamed folder: {dir_path} -> {new_path}")
+                        self.logger.debug("Renamed folder: %s -> %s", dir_path, new_path)
                 else:
                     self.logger.info(f"[DRY RUN] Would rename folder: {dir_path} -> {new_path}")
                 
@@ -161,81 +409,253 @@ class WoWUIMigrator:
     
     def _merge_directories(self, source_dir: str, target_dir: str):
         """Merge source directory into target directory."""
-        for item in os.listdir(source_dir):
-            source_item = os.path.join(source_dir, item)
-            target_item = os.path.join(target_dir, item)
+        with os.scandir(source_dir) as it:
+            entries = list(it)
+        
+        for entry in entries:
+            source_item = entry.path
+            target_item = os.path.join(target_dir, entry.name)
+            target_exists = os.path.lexists(target_item)
             
-            if os.path.isdir(source_item):
-                if os.path.exists(target_item):
+            if entry.is_dir(follow_symlinks=False):
+                if target_exists:
                     self._merge_directories(source_item, target_item)
                 else:
-                    shutil.move(source_item, target_item)
+                    self._move(source_item, target_item)
             else:
-                if os.path.exists(target_item):
+                if target_exists:
                     # File exists, create backup and overwrite
                     backup_name = f"{target_item}.backup_{int(time.time())}"
-                    shutil.move(target_item, backup_name)
+                    self._move(target_item, backup_name)
                     self.logger.info(f"Backed up existing file: {target_item} -> {backup_name}")
-                shutil.move(source_item, target_item)
+                    self._move(source_item, target_item, replace=True)
+                else:
+                    self._move(source_item, target_item)
         
         # Remove empty source directory
         if not os.listdir(source_dir):
             os.rmdir(source_dir)
     
+    def _move(self, source: str, target: str, replace: bool = False):
+        """Move a file or directory with a single rename, copying only across filesystems."""
+        try:
+            if replace:
+                os.replace(source, target)
+            else:
+                os.rename(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(source, target)
+    
     def update_file_contents(self, content_mappings: Dict[str, str], old_account: str = None) -> List[str]:
         """Update file contents according to the mappings."""
         updated_files = []
+        if not content_mappings:
+            return updated_files
         
-        for root, dirs, files in os.walk(self.working_path):
-            # If we're migrating a specific account, only process files under that account
+        # One alternation of all old names (longest first) so each file is scanned once.
+        # Word boundaries avoid partial matches. ASCII names (the usual case) are matched
+        # directly on the file bytes, skipping the decode/encode round trip.
+        old_texts = sorted(content_mappings, key=len, reverse=True)
+        if all(_is_ascii(old_text) and _is_ascii(new_text) for old_text, new_text in content_mappings.items()):
+            # _BytesNamePattern finds the same matches as \b on the decoded text.
+            pattern = _BytesNamePattern(old_texts)
+            lut = {old_text.lower().encode('ascii'): new_text.encode('ascii')
+                   for old_text, new_text in content_mappings.items()}
+        else:
+            pattern = re.compile(
+                r'\b(' + '|'.join(re.escape(old_text) for old_text in old_texts) + r')\b',
+                re.IGNORECASE
+            )
+            lut = {old_text.lower(): new_text for old_text, new_text in content_mappings.items()}
+        
+        # Cheap substring probe on the raw bytes. bytes.lower() only folds ASCII, so
+        # non-ASCII names can't be probed this way and every file goes to the regex.
+        if all(_is_ascii(old_text) for old_text in content_mappings):
+            needles = [old_text.encode('utf-8').lower() for old_text in content_mappings]
+            # Same probe as a regex, for memory-mapped files that can't be lowercased
+            probe = re.compile(b'|'.join(re.escape(needle) for needle in needles), re.IGNORECASE)
+        else:
+            needles = probe = None
+        
+        working_root = str(self.working_path)
+        accounts_root = os.path.join(working_root, "Account")
+        account_names = {old_account, content_mappings.get(old_account, old_account)}
+        join = os.path.join
+        
+        # Collect candidate files first, then process them (optionally in parallel)
+        candidates = []
+        for root, dirs, files in _walk(working_root):
             if old_account:
-                account_path = os.path.join(self.working_path, "Account", old_account)
-                new_account = content_mappings.get(old_account, old_account)
-                new_account_path = os.path.join(self.working_path, "Account", new_account)
-                
-                # Only process files under the old or new account path, or global config files
-                if not (root.startswith(account_path) or 
-                       root.startswith(new_account_path) or 
-                       root == str(self.working_path)):  # Global config files like Config.wtf
+                # Global config files like Config.wtf live at the top level; below that
+                # only the old and new account folders are walked
+                if root == working_root:
+                    dirs[:] = [name for name in dirs if name == "Account"]
+                elif root == accounts_root:
+                    dirs[:] = [name for name in dirs if name in account_names]
                     continue
             
             for file_name in files:
-                file_path = os.path.join(root, file_name)
-                file_ext = os.path.splitext(file_name)[1].lower()
+                stem, dot, file_ext = file_name.rpartition('.')
                 
-                # Skip binary files and only process known config file types
-                if file_ext not in self.config_extensions:
+                # Skip binary files and backups, only process known config file types.
+                # Like os.path.splitext, names without a dot or with only a leading
+                # one (e.g. ".lua") have no extension.
+                if not (dot and stem.strip('.')) or file_ext.lower() not in CONFIG_EXTENSIONS:
                     continue
                 
-                try:
-                    # Read file content
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
+                candidates.append(join(root, file_name))
+        
+        process = partial(self._process_file, pattern=pattern, lut=lut, needles=needles, probe=probe)
+        if self.jobs == 1:
+            results = list(map(process, candidates))
+        else:
+            with ThreadPoolExecutor(max_workers=self.jobs or DEFAULT_WORKERS) as executor:
+                results = list(executor.map(process, candidates))
+        
+        for file_path, changed in results:
+            if changed:
+                updated_files.append(file_path)
+                self.changes_made.append(f"Content: {file_path}")
+        
+        return updated_files
+    
+    def _process_file(self, file_path: str, pattern, lut: Dict[str, str],
+                      needles: List[bytes] = None, probe=None) -> Tuple[str, bool]:
+        """Apply the content mappings to a single file, returning whether it changed."""
+        try:
+            stream = False
+            
+            # Read file content
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > MMAP_THRESHOLD:
+                    # Probe large files through a mapping so misses are never read in
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if probe is not None and not probe.search(mm):
+                            return file_path, False
+                        
+                        # Very large files are streamed to keep memory bounded. Only bytes
+                        # patterns can be, as chunks may split multi-byte characters.
+                        stream = size > STREAM_THRESHOLD and isinstance(pattern.pattern, bytes)
+                        if not stream:
+                            data, n = _apply_mappings(mm, pattern, lut)
+                else:
+                    raw = f.read()
                     
-                    original_content = content
+                    # Skip files that can't contain any of the names
+                    if needles is not None:
+                        lower = raw.lower()
+                        if not any(needle in lower for needle in needles):
+                            return file_path, False
                     
-                    # Apply all content mappings
-                    for old_text, new_text in content_mappings.items():
-                        # Use word boundaries to avoid partial matches
-                        pattern = rf'\b{re.escape(old_text)}\b'
-                        content = re.sub(pattern, new_text, content, flags=re.IGNORECASE)
+                    data, n = _apply_mappings(raw, pattern, lut)
+            
+            if stream:
+                # Writes the file as it goes (or only counts matches in a dry run)
+                # Room for the longest name plus the UTF-8 character after it
+                overlap = max(256, max(len(old_text) for old_text in lut) + 5)
+                n = self._replace_streaming(file_path, pattern, lambda m: lut[m.group(0).lower()],
+                                            overlap=overlap)
+            elif n > 0 and not self.dry_run:
+                # If anything was replaced, write back to file
+                self._write_atomic(file_path, data)
+            
+            if n > 0:
+                if not self.dry_run:
+                    self.logger.debug("Updated file content: %s", file_path)
+                else:
+                    self.logger.info(f"[DRY RUN] Would update file content: {file_path}")
+                return file_path, True
+        
+        except Exception as e:
+            self.logger.error(f"Error processing file {file_path}: {e}")
+        
+        return file_path, False
+    
+    def _replace_streaming(self, file_path: str, pattern, repl, chunk_size: int = STREAM_CHUNK_SIZE,
+                           overlap: int = 256) -> int:
+        """Replace pattern matches chunk by chunk, returning the number of replacements.
+        
+        The last overlap bytes of each chunk are carried into the next one so that
+        matches spanning a chunk boundary are still found; overlap must be longer than
+        the longest match plus the character after it. The result goes to a temporary
+        file that replaces the original only if something changed, keeping symlinks and
+        the file mode as _write_atomic does. Nothing is written in a dry run.
+        """
+        total = 0
+        real_path = os.path.realpath(file_path)
+        if self.dry_run:
+            dst = None
+        else:
+            fd, tmp_path = _temp_file_beside(real_path)
+            dst = os.fdopen(fd, 'wb')
+        write = dst.write if dst else (lambda data: None)
+        
+        try:
+            with open(real_path, 'rb') as src:
+                tail = b''
+                start = 0  # Bytes of tail before start are already written, kept only as lookbehind context
+                while True:
+                    chunk = src.read(chunk_size)
+                    buf = tail + chunk
+                    at_eof = not chunk
                     
-                    # If content changed, write back to file
-                    if content != original_content:
-                        if not self.dry_run:
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(content)
-                            self.logger.info(f"Updated file content: {file_path}")
-                        else:
-                            self.logger.info(f"[DRY RUN] Would update file content: {file_path}")
-                        
-                        updated_files.append(file_path)
-                        self.changes_made.append(f"Content: {file_path}")
-                
-                except Exception as e:
-                    self.logger.error(f"Error processing file {file_path}: {e}")
+                    # Matches starting before limit are complete, later ones may be cut off
+                    limit = len(buf) if at_eof else len(buf) - overlap
+                    pos = start
+                    for m in pattern.finditer(buf, start):
+                        if m.start() >= limit:
+                            break
+                        write(buf[pos:m.start()])
+                        write(repl(m))
+                        pos = m.end()
+                        total += 1
+                    
+                    if at_eof:
+                        write(buf[pos:])
+                        break
+                    
+                    cut = max(pos, limit)
+                    write(buf[pos:cut])
+                    # Keep the (up to 4 byte) character before the cut as context
+                    keep = max(cut - 4, 0)
+                    tail, start = buf[keep:], cut - keep
+            
+            if dst:
+                dst.close()
+                if total:
+                    shutil.copymode(real_path, tmp_path)
+                    os.replace(tmp_path, real_path)
+                else:
+                    os.remove(tmp_path)
+        except BaseException:
+            if dst:
+                dst.close()
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
         
-        return updated_files
+        return total
+    
+    def _write_atomic(self, file_path: str, data: bytes):
+        """Write data to a temporary file next to file_path, then swap it into place.
+        
+        Symlinks are resolved first so the link target is updated rather than the
+        link replaced, and the original file mode is kept.
+        """
+        real_path = os.path.realpath(file_path)
+        fd, tmp_path = _temp_file_beside(real_path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            shutil.copymode(real_path, tmp_path)
+            os.replace(tmp_path, real_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
     
     def migrate(self, old_realm: str, new_realm: str, 
                 old_char: str = None, new_char: str = None,
@@ -254,9 +674,14 @@ class WoWUIMigrator:
             self.logger.error(f"WTF folder not found: {self.wtf_path}")
             return False
         
-        # Always create a copy for safety
-        copy_path = self.create_migration_copy(old_realm, new_realm, old_char, new_char)
-        self.logger.info(f"Working on copy at: {self.working_path}")
+        # Create a copy for safety unless in-place migration was requested
+        try:
+            copy_path = self.create_migration_copy(old_realm, new_realm, old_char, new_char)
+        except (OSError, shutil.Error) as e:
+            self.logger.error(f"Failed to create migration copy: {e}")
+            return False
+        if not self.in_place:
+            self.logger.info(f"Working on copy at: {self.working_path}")
         
         try:
             # Get mappings
@@ -273,8 +698,13 @@ class WoWUIMigrator:
             self.logger.info(f"Migration completed!")
             self.logger.info(f"Folders renamed: {len(renamed_folders)}")
             self.logger.info(f"Files updated: {len(updated_files)}")
-            self.logger.info(f"Migrated copy created at: {copy_path}")
-            self.logger.info(f"Original WTF folder unchanged at: {self.wtf_path}")
+            if self.in_place and self.dry_run:
+                self.logger.info(f"[DRY RUN] WTF folder would be migrated in place at: {copy_path}")
+            elif self.in_place:
+                self.logger.info(f"WTF folder migrated in place at: {copy_path}")
+            else:
+                self.logger.info(f"Migrated copy created at: {copy_path}")
+                self.logger.info(f"Original WTF folder unchanged at: {self.wtf_path}")
             
             return True
             
@@ -284,32 +714,33 @@ class WoWUIMigrator:
     
     def get_realm_and_character_info(self) -> Dict[str, List[str]]:
         """Scan WTF folder to find existing realm and character names."""
-        info = {"realms": [], "characters": [], "accounts": []}
+        accounts, realms, characters = set(), set(), set()
         
         account_path = self.wtf_path / "Account"
         if not account_path.exists():
-            return info
+            return {"realms": [], "characters": [], "accounts": []}
         
         # Find accounts
-        for account_dir in account_path.iterdir():
-            if account_dir.is_dir():
-                info["accounts"].append(account_dir.name)
+        with os.scandir(account_path) as account_entries:
+            for account_dir in account_entries:
+                if not account_dir.is_dir():
+                    continue
+                accounts.add(account_dir.name)
                 
                 # Find realms in this account
-                for item in account_dir.iterdir():
-                    if item.is_dir() and item.name != "SavedVariables":
-                        realm_name = item.name
-                        if realm_name not in info["realms"]:
-                            info["realms"].append(realm_name)
+                with os.scandir(account_dir.path) as realm_entries:
+                    for item in realm_entries:
+                        if item.name == "SavedVariables" or not item.is_dir():
+                            continue
+                        realms.add(item.name)
                         
                         # Find characters in this realm
-                        for char_item in item.iterdir():
-                            if char_item.is_dir() and char_item.name != "SavedVariables":
-                                char_name = char_item.name
-                                if char_name not in info["characters"]:
-                                    info["characters"].append(char_name)
+                        with os.scandir(item.path) as char_entries:
+                            for char_item in char_entries:
+                                if char_item.name != "SavedVariables" and char_item.is_dir():
+                                    characters.add(char_item.name)
         
-        return info
+        return {"realms": sorted(realms), "characters": sorted(characters), "accounts": sorted(accounts)}
 
 
 def main():
@@ -322,13 +753,22 @@ def main():
     parser.add_argument("--old-account", help="Source account name")
     parser.add_argument("--new-account", help="Target account name")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be changed without making changes")
+    parser.add_argument("--in-place", action="store_true",
+                        help="Modify the WTF folder directly instead of a copy. Much faster and uses no extra disk space, "
+                             "but there is no automatic backup, so only use this if you have your own")
+    parser.add_argument("--jobs", type=_job_count, default=1, metavar="N",
+                        help="Number of threads used to update file contents (0 = pick automatically, default: 1)")
+    parser.add_argument("--verbose", action="store_true", help="Log every renamed folder and updated file")
     parser.add_argument("--scan", action="store_true", help="Scan WTF folder to show existing realms, characters, and accounts")
     
     args = parser.parse_args()
+    _configure_logging(verbose=args.verbose)
     
     migrator = WoWUIMigrator(
         wtf_path=args.wtf_path,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        in_place=args.in_place,
+        jobs=args.jobs
     )
     
     if args.scan: